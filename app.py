@@ -1,22 +1,46 @@
-from flask import Flask, render_template, request, jsonify, send_file
+from flask import Flask, render_template, request, jsonify, send_file, Response, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.exceptions import RequestedRangeNotSatisfiable
+import orjson
 import os
+import atexit
 import csv
+import gzip
+import hashlib
+import heapq
+import io
 import time
-import json
-from datetime import datetime, timedelta
+import re
+import secrets
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import (InvalidSessionIdException, NoSuchWindowException,
+                                        TimeoutException, WebDriverException)
 import tempfile
 import threading
-from concurrent.futures import ThreadPoolExecutor
+import zlib
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import logging
 
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that serializes responses and parses request bodies with orjson"""
+    
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode('utf-8')
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
 app = Flask(__name__)
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'your-secret-key-here')
+app.json = OrjsonProvider(app)
+# Without a configured key, use a random per-process one rather than a guessable literal
+app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY') or secrets.token_hex(32)
+# Request bodies are only URL lists; reject anything bigger before parsing it
+app.config['MAX_CONTENT_LENGTH'] = 256 * 1024
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -29,10 +53,131 @@ scraping_status = {
     'concerts_found': 0,
     'unique_venues': set(),
     'current_artist': '',
-    'errors': []
+    'errors': [],
+    'version': 0  # bumped on every change, used as the status ETag
 }
 
+# Distinguishes status versions across process restarts
+_STATUS_EPOCH = format(int(time.time()), 'x')
+
+# One row per scraped concert; field names double as the CSV header
+Concert = namedtuple('Concert', ['artist_name', 'venue_name', 'venue_address', 'concert_date'])
+
 concert_data = []
+_status_lock = threading.Lock()
+_status_changed = threading.Condition(_status_lock)
+_run_stop = None  # stop event of the current run, set by /stop_scraping
+_run_id = 0  # bumped each time start_scraping replaces concert_data
+
+def mark_status_changed():
+    """Bump the status version and wake event streams; the caller must hold _status_lock"""
+    scraping_status['version'] += 1
+    _status_changed.notify_all()
+
+def status_etag():
+    """Return the ETag for the current status; the caller must hold _status_lock"""
+    return f"{_STATUS_EPOCH}-{scraping_status['version']}"
+
+# Each worker drives its own headless Chrome, so keep the pool small
+MAX_SCRAPER_WORKERS = int(os.environ.get('MAX_SCRAPER_WORKERS', min(4, (os.cpu_count() or 1) * 2)))
+
+class RateLimiter:
+    """Token bucket shared by scraper threads to space out page loads"""
+    
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+# At most one new artist page every half second across all workers
+page_load_limiter = RateLimiter(rate=2)
+
+# Cache of scraped concerts keyed by normalized artist URL, shared across scraping runs
+ARTIST_CACHE_TTL = 6 * 60 * 60  # seconds
+_artist_cache = {}
+_artist_cache_expiry = []  # min-heap of (expires_at, cache key)
+_artist_cache_lock = threading.Lock()
+_artist_cache_timer = None
+
+def artist_cache_key(artist_url):
+    """Normalize an artist URL so scheme, www. and letter case share one cache entry"""
+    key = artist_url.split('://', 1)[-1].lower().rstrip('/')
+    return key[4:] if key.startswith('www.') else key
+
+def get_cached_concerts(artist_url):
+    """Return cached concerts for an artist URL, or None if missing or expired"""
+    with _artist_cache_lock:
+        entry = _artist_cache.get(artist_cache_key(artist_url))
+    if entry is None:
+        return None
+    cached_at, concerts = entry
+    if time.time() - cached_at > ARTIST_CACHE_TTL:
+        return None
+    return concerts
+
+def cache_concerts(artist_url, concerts):
+    """Store scraped concerts for an artist URL"""
+    key = artist_cache_key(artist_url)
+    now = time.time()
+    with _artist_cache_lock:
+        _artist_cache[key] = (now, concerts)
+        heapq.heappush(_artist_cache_expiry, (now + ARTIST_CACHE_TTL, key))
+        evict_expired_concerts(now)
+        schedule_cache_eviction()
+
+def evict_expired_concerts(now):
+    """Drop cache entries past their TTL; the caller must hold _artist_cache_lock"""
+    while _artist_cache_expiry and _artist_cache_expiry[0][0] <= now:
+        _, key = heapq.heappop(_artist_cache_expiry)
+        entry = _artist_cache.get(key)
+        # The URL may have been scraped again since this heap entry was pushed
+        if entry is not None and entry[0] + ARTIST_CACHE_TTL <= now:
+            del _artist_cache[key]
+
+def schedule_cache_eviction():
+    """Arm a timer for the earliest cache expiry; the caller must hold _artist_cache_lock"""
+    global _artist_cache_timer
+    if _artist_cache_timer is not None or not _artist_cache_expiry:
+        return
+    delay = max(0, _artist_cache_expiry[0][0] - time.time())
+    _artist_cache_timer = threading.Timer(delay, run_cache_eviction)
+    _artist_cache_timer.daemon = True
+    _artist_cache_timer.start()
+
+def run_cache_eviction():
+    """Timer callback that evicts expired entries and re-arms for the next one"""
+    global _artist_cache_timer
+    with _artist_cache_lock:
+        _artist_cache_timer = None
+        evict_expired_concerts(time.time())
+        schedule_cache_eviction()
+
+# Scheme and host are case-insensitive; the artist path is matched as given
+# and group 1 is the artist slug
+ARTIST_URL_RE = re.compile(r'^(?i:https?://(?:www\.)?bandsintown\.com)/a/([^/?#]+)')
+_DASH_TO_SPACE = str.maketrans('-', ' ')
+
+def artist_name_from_url(artist_url):
+    """Turn an artist URL slug like 'taylor-swift' into 'Taylor Swift'"""
+    # start_scraping only passes URLs already trimmed by ARTIST_URL_RE
+    match = ARTIST_URL_RE.match(artist_url)
+    slug = match.group(1) if match else artist_url.rstrip('/').rpartition('/')[2]
+    return slug.translate(_DASH_TO_SPACE).title()
 
 def get_chrome_options():
     """Configure Chrome options for headless operation"""
@@ -43,24 +188,67 @@ def get_chrome_options():
     chrome_options.add_argument('--disable-gpu')
     chrome_options.add_argument('--window-size=1920,1080')
     chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+    # Only the event text is needed, so skip downloading and decoding images
+    chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+    # Return from driver.get() once the DOM is ready; explicit waits cover the rest
+    chrome_options.page_load_strategy = 'eager'
     return chrome_options
 
-def scrape_artist_concerts(artist_url, max_pages=3):
-    """Scrape concerts for a single artist"""
-    driver = None
+CONCERT_CARD_SELECTOR = "[data-testid='event-card'], .event-item, .concert-item, .show-item"
+VENUE_SELECTORS = [".venue-name", "[data-testid='venue-name']", ".event-venue", "h3", "h4"]
+DATE_SELECTORS = [".event-date", "[data-testid='event-date']", ".date", ".show-date", "time"]
+ADDRESS_SELECTORS = [".venue-location", "[data-testid='venue-location']", ".event-location", ".location", ".city"]
+
+# Returns [venue, date, address] for each card from arguments[1] onwards,
+# using the first selector in each list that yields non-empty text
+EXTRACT_CONCERTS_JS = """
+const [cardSelector, offset, venueSelectors, dateSelectors, addressSelectors] = arguments;
+const pick = (card, selectors) => {
+    for (const selector of selectors) {
+        const el = card.querySelector(selector);
+        const text = el ? el.innerText.trim() : '';
+        if (text) return text;
+    }
+    return '';
+};
+return Array.from(document.querySelectorAll(cardSelector)).slice(offset).map(card => [
+    pick(card, venueSelectors),
+    pick(card, dateSelectors),
+    pick(card, addressSelectors)
+]);
+"""
+
+def driver_session_lost(driver, error):
+    """Tell whether a WebDriver error left the browser session unusable"""
+    if isinstance(error, (InvalidSessionIdException, NoSuchWindowException)):
+        return True
+    try:
+        driver.current_url
+    except WebDriverException:
+        return True
+    return False
+
+def scrape_artist_concerts(artist_url, max_pages=3, driver=None):
+    """Scrape concerts for a single artist, optionally reusing a running driver
+    
+    Returns (concerts, completed); completed is False when an error cut the
+    scrape short and the concerts may be partial.
+    """
+    owns_driver = driver is None
     concerts = []
     
     try:
-        driver = webdriver.Chrome(options=get_chrome_options())
+        if owns_driver:
+            driver = webdriver.Chrome(options=get_chrome_options())
         driver.get(artist_url)
         
         # Wait for page to load
-        WebDriverWait(driver, 10).wait(
+        WebDriverWait(driver, 10).until(
             EC.presence_of_element_located((By.TAG_NAME, "body"))
         )
         
         # Extract artist name from URL or page
-        artist_name = artist_url.split('/')[-1].replace('-', ' ').title()
+        artist_name = artist_name_from_url(artist_url)
         try:
             artist_element = driver.find_element(By.CSS_SELECTOR, "h1, .artist-name, [data-testid='artist-name']")
             artist_name = artist_element.text.strip()
@@ -69,84 +257,40 @@ def scrape_artist_concerts(artist_url, max_pages=3):
         
         # Click "Past" tab
         try:
-            past_button = WebDriverWait(driver, 10).wait(
+            past_button = WebDriverWait(driver, 10).until(
                 EC.element_to_be_clickable((By.XPATH, "//button[contains(text(), 'Past')] | //a[contains(text(), 'Past')] | //*[contains(@class, 'past')]"))
             )
+            event_cards = driver.find_elements(By.CSS_SELECTOR, "[data-testid='event-card'], .event-item, .concert-item")
             past_button.click()
-            time.sleep(2)
+            # Wait for the upcoming list to be swapped out rather than sleeping a fixed time
+            if event_cards:
+                try:
+                    WebDriverWait(driver, 2).until(EC.staleness_of(event_cards[0]))
+                except TimeoutException:
+                    pass
         except TimeoutException:
             logger.warning(f"Could not find 'Past' button for {artist_name}")
-            return concerts
+            return concerts, True
         
         # Scrape concerts with pagination
+        cards_seen = 0
         for page in range(max_pages):
             try:
                 # Wait for concerts to load
-                WebDriverWait(driver, 10).wait(
+                WebDriverWait(driver, 10).until(
                     EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='event-card'], .event-item, .concert-item"))
                 )
                 
-                # Extract concert information
-                concert_elements = driver.find_elements(By.CSS_SELECTOR, "[data-testid='event-card'], .event-item, .concert-item, .show-item")
+                # Extract every new card in a single WebDriver round trip
+                rows = driver.execute_script(
+                    EXTRACT_CONCERTS_JS, CONCERT_CARD_SELECTOR, cards_seen,
+                    VENUE_SELECTORS, DATE_SELECTORS, ADDRESS_SELECTORS
+                )
+                cards_seen += len(rows)
                 
-                for element in concert_elements:
-                    try:
-                        # Extract venue name
-                        venue_name = ""
-                        venue_selectors = [
-                            ".venue-name", "[data-testid='venue-name']", 
-                            ".event-venue", "h3", "h4"
-                        ]
-                        for selector in venue_selectors:
-                            try:
-                                venue_elem = element.find_element(By.CSS_SELECTOR, selector)
-                                venue_name = venue_elem.text.strip()
-                                if venue_name:
-                                    break
-                            except:
-                                continue
-                        
-                        # Extract date
-                        date_str = ""
-                        date_selectors = [
-                            ".event-date", "[data-testid='event-date']",
-                            ".date", ".show-date", "time"
-                        ]
-                        for selector in date_selectors:
-                            try:
-                                date_elem = element.find_element(By.CSS_SELECTOR, selector)
-                                date_str = date_elem.text.strip()
-                                if date_str:
-                                    break
-                            except:
-                                continue
-                        
-                        # Extract venue address/location
-                        venue_address = ""
-                        address_selectors = [
-                            ".venue-location", "[data-testid='venue-location']",
-                            ".event-location", ".location", ".city"
-                        ]
-                        for selector in address_selectors:
-                            try:
-                                addr_elem = element.find_element(By.CSS_SELECTOR, selector)
-                                venue_address = addr_elem.text.strip()
-                                if venue_address:
-                                    break
-                            except:
-                                continue
-                        
-                        if venue_name and date_str:
-                            concerts.append({
-                                'artist_name': artist_name,
-                                'venue_name': venue_name,
-                                'venue_address': venue_address,
-                                'concert_date': date_str
-                            })
-                    
-                    except Exception as e:
-                        logger.warning(f"Error extracting concert data: {e}")
-                        continue
+                for venue_name, date_str, venue_address in rows:
+                    if venue_name and date_str:
+                        concerts.append(Concert(artist_name, venue_name, venue_address, date_str))
                 
                 # Try to click "More Dates" or "Load More" button
                 try:
@@ -154,7 +298,10 @@ def scrape_artist_concerts(artist_url, max_pages=3):
                         "//button[contains(text(), 'More Dates')] | //button[contains(text(), 'Load More')] | //button[contains(text(), 'Show More')]"
                     )
                     driver.execute_script("arguments[0].click();", more_button)
-                    time.sleep(3)  # Wait for new content to load
+                    # Wait for new cards to be appended instead of sleeping a fixed time
+                    WebDriverWait(driver, 10).until(
+                        lambda d: len(d.find_elements(By.CSS_SELECTOR, CONCERT_CARD_SELECTOR)) > cards_seen
+                    )
                 except:
                     logger.info(f"No more pages available for {artist_name}")
                     break
@@ -164,121 +311,416 @@ def scrape_artist_concerts(artist_url, max_pages=3):
                 break
         
         logger.info(f"Found {len(concerts)} concerts for {artist_name}")
-        return concerts
+        return concerts, True
+        
+    except WebDriverException as e:
+        if not owns_driver and driver_session_lost(driver, e):
+            # Let the caller replace a browser that is no longer usable
+            raise
+        logger.error(f"Error scraping {artist_url}: {e}")
+        return concerts, False
         
     except Exception as e:
         logger.error(f"Error scraping {artist_url}: {e}")
-        return concerts
+        return concerts, False
         
     finally:
-        if driver:
+        if owns_driver and driver:
             driver.quit()
 
-def scrape_multiple_artists(artist_urls):
-    """Scrape concerts for multiple artists"""
-    global scraping_status, concert_data
+class WorkerDrivers:
+    """Starts one Chrome per worker thread on demand and quits them all at the end"""
     
-    scraping_status['is_running'] = True
-    scraping_status['artists_processed'] = 0
-    scraping_status['concerts_found'] = 0
-    scraping_status['unique_venues'] = set()
-    scraping_status['errors'] = []
-    concert_data = []
+    def __init__(self):
+        self._local = threading.local()
+        self._drivers = []
+        self._lock = threading.Lock()
     
-    try:
-        for i, url in enumerate(artist_urls):
-            if not scraping_status['is_running']:
-                break
-                
-            scraping_status['current_artist'] = url.split('/')[-1].replace('-', ' ').title()
-            logger.info(f"Processing artist {i+1}/{len(artist_urls)}: {scraping_status['current_artist']}")
-            
+    def get(self):
+        """Return the calling thread's driver, starting Chrome if needed"""
+        driver = getattr(self._local, 'driver', None)
+        if driver is None:
+            driver = webdriver.Chrome(options=get_chrome_options())
+            self._local.driver = driver
+            with self._lock:
+                self._drivers.append(driver)
+        return driver
+    
+    def discard(self):
+        """Quit the calling thread's driver so the next artist gets a fresh one"""
+        driver = getattr(self._local, 'driver', None)
+        if driver is None:
+            return
+        self._local.driver = None
+        with self._lock:
+            self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Error closing Chrome: {e}")
+    
+    def quit_all(self):
+        """Quit every driver started by this pool"""
+        with self._lock:
+            drivers, self._drivers = self._drivers, []
+        for driver in drivers:
             try:
-                concerts = scrape_artist_concerts(url.strip())
-                concert_data.extend(concerts)
-                
-                scraping_status['concerts_found'] += len(concerts)
-                for concert in concerts:
-                    scraping_status['unique_venues'].add(concert['venue_name'])
-                    
+                driver.quit()
             except Exception as e:
-                error_msg = f"Error processing {url}: {str(e)}"
-                scraping_status['errors'].append(error_msg)
-                logger.error(error_msg)
+                logger.warning(f"Error closing Chrome: {e}")
+
+# Polls only carry the latest errors; the full list is at /scraping_errors
+STATUS_ERROR_LIMIT = 10
+
+def get_status_snapshot():
+    """Return a consistent copy of the scraping status and its ETag"""
+    with _status_lock:
+        snapshot = {
+            'is_running': scraping_status['is_running'],
+            'stop_requested': _run_stop is not None and _run_stop.is_set(),
+            'artists_processed': scraping_status['artists_processed'],
+            'concerts_found': scraping_status['concerts_found'],
+            'unique_venues': len(scraping_status['unique_venues']),
+            'current_artist': scraping_status['current_artist'],
+            'error_count': len(scraping_status['errors']),
+            'errors': scraping_status['errors'][-STATUS_ERROR_LIMIT:]
+        }
+        etag = status_etag()
+    return snapshot, etag
+
+def scrape_artist_with_cache(artist_url, drivers, stop_event):
+    """Return concerts for one artist, scraping only on a cache miss
+    
+    Returns None instead when the run was stopped before the artist was scraped.
+    """
+    if stop_event.is_set():
+        return None
+    
+    artist_name = artist_name_from_url(artist_url)
+    with _status_lock:
+        scraping_status['current_artist'] = artist_name
+        mark_status_changed()
+    
+    concerts = get_cached_concerts(artist_url)
+    if concerts is not None:
+        logger.info(f"Using cached concerts for {artist_name}")
+        return concerts
+    
+    logger.info(f"Processing artist: {artist_name}")
+    page_load_limiter.acquire()
+    # The run may have been stopped while this worker waited for its turn
+    if stop_event.is_set():
+        return None
+    try:
+        concerts, completed = scrape_artist_concerts(artist_url, driver=drivers.get())
+    except WebDriverException:
+        # Only raised once the browser session is gone
+        drivers.discard()
+        raise
+    # Partial results from a failed scrape and empty ones from a page that
+    # didn't load would hide the artist's concerts until the entry expired
+    if completed and concerts:
+        cache_concerts(artist_url, concerts)
+    return concerts
+
+def scrape_multiple_artists(artist_urls, stop_event):
+    """Scrape concerts for multiple artists; start_scraping has already reset the status"""
+    # Chrome instances live for the whole run instead of one launch per artist
+    drivers = WorkerDrivers()
+    
+    try:
+        max_workers = max(1, min(MAX_SCRAPER_WORKERS, len(artist_urls)))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(scrape_artist_with_cache, url, drivers, stop_event): url for url in artist_urls}
             
-            scraping_status['artists_processed'] += 1
+            for future in as_completed(futures):
+                if stop_event.is_set():
+                    # Drop the artists no worker has picked up yet
+                    for pending in futures:
+                        pending.cancel()
+                
+                # Artists skipped because of a stop don't count as processed
+                if future.cancelled():
+                    continue
+                url = futures[future]
+                try:
+                    concerts = future.result()
+                    if concerts is None:
+                        continue
+                    with _status_lock:
+                        concert_data.extend(concerts)
+                        scraping_status['concerts_found'] += len(concerts)
+                        scraping_status['unique_venues'].update(concert.venue_name for concert in concerts)
+                        mark_status_changed()
+                        
+                except Exception as e:
+                    error_msg = f"Error processing {url}: {str(e)}"
+                    with _status_lock:
+                        scraping_status['errors'].append(error_msg)
+                        mark_status_changed()
+                    logger.error(error_msg)
+                
+                with _status_lock:
+                    scraping_status['artists_processed'] += 1
+                    mark_status_changed()
             
     except Exception as e:
         logger.error(f"Error in scraping process: {e}")
-        scraping_status['errors'].append(f"General error: {str(e)}")
+        with _status_lock:
+            scraping_status['errors'].append(f"General error: {str(e)}")
+            mark_status_changed()
     
     finally:
-        scraping_status['is_running'] = False
-        scraping_status['current_artist'] = ''
+        drivers.quit_all()
+        # Only now, with every worker finished, may a new run start
+        with _status_lock:
+            scraping_status['is_running'] = False
+            scraping_status['current_artist'] = ''
+            mark_status_changed()
+
+# The index page takes no template variables, so it is rendered and gzipped once
+_index_page = None
+
+def get_index_page():
+    """Return the rendered index page as (raw bytes, gzipped bytes, ETag)"""
+    global _index_page
+    if _index_page is None:
+        html = render_template('index.html').encode('utf-8')
+        _index_page = (html, gzip.compress(html, compresslevel=6), hashlib.md5(html).hexdigest())
+    return _index_page
 
 @app.route('/')
 def index():
-    return render_template('index.html')
+    html, html_gz, etag = get_index_page()
+    headers = {'Cache-Control': 'public, max-age=3600', 'Vary': 'Accept-Encoding'}
+    # Check the quality, not membership, so "gzip;q=0" counts as a refusal
+    if request.accept_encodings['gzip'] > 0:
+        # Each encoding is a separate representation and needs its own ETag
+        body, etag = html_gz, f'{etag}-gz'
+        headers['Content-Encoding'] = 'gzip'
+    else:
+        body = html
+    
+    if etag in request.if_none_match:
+        response = Response(status=304, headers=headers)
+    else:
+        response = Response(body, mimetype='text/html', headers=headers)
+    response.set_etag(etag)
+    return response
 
 @app.route('/start_scraping', methods=['POST'])
 def start_scraping():
-    global scraping_status
-    
-    if scraping_status['is_running']:
-        return jsonify({'error': 'Scraping already in progress'}), 400
+    global scraping_status, concert_data, _run_stop, _run_id
     
-    data = request.json
+    data = request.get_json(silent=True, cache=False)
+    if not isinstance(data, dict) or not isinstance(data.get('urls', []), list):
+        return jsonify({'error': 'Expected a JSON body with a list of URLs'}), 400
     artist_urls = data.get('urls', [])
     
+    artist_urls = [url.strip() for url in artist_urls if isinstance(url, str) and url.strip()]
     if not artist_urls:
         return jsonify({'error': 'No URLs provided'}), 400
     
+    # Keep only artist pages, trimmed of query strings and trailing paths
+    matches = [ARTIST_URL_RE.match(url) for url in artist_urls]
+    invalid_urls = [url for url, match in zip(artist_urls, matches) if match is None]
+    
+    # Drop duplicates, including scheme/www/case variants, while keeping submission order
+    unique_urls = {}
+    for match in matches:
+        if match:
+            unique_urls.setdefault(artist_cache_key(match.group(0)), match.group(0))
+    artist_urls = list(unique_urls.values())
+    
+    if not artist_urls:
+        return jsonify({'error': 'No valid Bandsintown artist URLs provided', 'invalid_urls': invalid_urls}), 400
+    
+    # Check and claim the run under one lock so concurrent requests can't both
+    # start one, and a stopped run still draining its workers blocks a new one
+    stop_event = threading.Event()
+    with _status_lock:
+        if scraping_status['is_running']:
+            return jsonify({'error': 'Scraping already in progress'}), 400
+        scraping_status['is_running'] = True
+        scraping_status['artists_processed'] = 0
+        scraping_status['concerts_found'] = 0
+        scraping_status['unique_venues'] = set()
+        scraping_status['errors'] = []
+        scraping_status['current_artist'] = ''
+        concert_data = []
+        _run_id += 1
+        _run_stop = stop_event
+        mark_status_changed()
+    
     # Start scraping in background thread
-    thread = threading.Thread(target=scrape_multiple_artists, args=(artist_urls,))
+    thread = threading.Thread(target=scrape_multiple_artists, args=(artist_urls, stop_event))
     thread.daemon = True
     thread.start()
     
-    return jsonify({'message': 'Scraping started', 'total_artists': len(artist_urls)})
+    return jsonify({'message': 'Scraping started', 'total_artists': len(artist_urls), 'invalid_urls': invalid_urls})
 
 @app.route('/scraping_status')
 def get_scraping_status():
-    return jsonify({
-        'is_running': scraping_status['is_running'],
-        'artists_processed': scraping_status['artists_processed'],
-        'concerts_found': scraping_status['concerts_found'],
-        'unique_venues': len(scraping_status['unique_venues']),
-        'current_artist': scraping_status['current_artist'],
-        'errors': scraping_status['errors']
-    })
+    snapshot, etag = get_status_snapshot()
+    # Most polls land between changes, so answer those without a body
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = jsonify(snapshot)
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+# Idle streams send a comment this often so dropped clients are noticed
+STATUS_EVENT_KEEPALIVE = 15  # seconds
+# Each stream holds one of the few gunicorn threads, so streams end after
+# this long and clients reconnect, and only a handful may be open at once
+STATUS_EVENT_MAX_DURATION = 60  # seconds
+MAX_STATUS_EVENT_STREAMS = 4
+_status_event_slots = threading.BoundedSemaphore(MAX_STATUS_EVENT_STREAMS)
+
+def iter_status_events():
+    """Yield a server-sent event each time the scraping status changes"""
+    # Clients reconnect after this delay once a run is over or the stream expires
+    yield 'retry: 5000\n\n'
+    deadline = time.monotonic() + STATUS_EVENT_MAX_DURATION
+    last_etag = None
+    while True:
+        snapshot, etag = get_status_snapshot()
+        if etag != last_etag:
+            last_etag = etag
+            yield f"id: {etag}\ndata: {app.json.dumps(snapshot)}\n\n"
+            if not snapshot['is_running']:
+                return
+        else:
+            yield ': keepalive\n\n'
+        
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        with _status_changed:
+            _status_changed.wait_for(lambda: status_etag() != last_etag,
+                                     timeout=min(STATUS_EVENT_KEEPALIVE, remaining))
+
+@app.route('/scraping_events')
+def get_scraping_events():
+    if not _status_event_slots.acquire(blocking=False):
+        return jsonify({'error': 'Too many open status streams'}), 503, {'Retry-After': '5'}
+    response = Response(stream_with_context(iter_status_events()),
+                        mimetype='text/event-stream',
+                        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+    response.call_on_close(_status_event_slots.release)
+    return response
+
+@app.route('/scraping_errors')
+def get_scraping_errors():
+    with _status_lock:
+        errors = list(scraping_status['errors'])
+    return jsonify({'errors': errors})
 
 @app.route('/stop_scraping', methods=['POST'])
 def stop_scraping():
-    global scraping_status
-    scraping_status['is_running'] = False
+    # Workers skip the artists not yet started; is_running clears once they finish
+    with _status_lock:
+        if _run_stop is not None and scraping_status['is_running']:
+            _run_stop.set()
+            mark_status_changed()
     return jsonify({'message': 'Scraping stopped'})
 
+def iter_csv_chunks(concerts, chunk_size=1000):
+    """Yield the CSV for the given concerts in blocks of chunk_size rows"""
+    buffer = io.StringIO(newline='')
+    writer = csv.writer(buffer)
+    writer.writerow(Concert._fields)
+    
+    for start in range(0, len(concerts), chunk_size):
+        writer.writerows(concerts[start:start + chunk_size])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    
+    # Header only when there are no concerts
+    if buffer.tell():
+        yield buffer.getvalue()
+
+# Exports above this many rows are written to disk to support range requests
+LARGE_CSV_ROWS = 10_000
+_csv_export = None  # (run id, row count, path) of the last large export
+_csv_export_lock = threading.Lock()
+
+def open_csv_export(concerts, run_id):
+    """Write a run's concerts to a temp CSV file once per data set and open it for reading"""
+    global _csv_export
+    # Key on the run id rather than the list so a finished run's rows can be freed
+    with _csv_export_lock:
+        if not (_csv_export and _csv_export[0] == run_id and _csv_export[1] == len(concerts)):
+            with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', newline='', encoding='utf-8') as temp_file:
+                temp_file.writelines(iter_csv_chunks(concerts))
+            
+            # Open downloads of the previous file keep reading from their handle
+            remove_csv_export()
+            _csv_export = (run_id, len(concerts), temp_file.name)
+        
+        # Open before releasing the lock so a newer export can't remove the file first
+        return open(_csv_export[2], 'rb')
+
+def remove_csv_export():
+    """Delete the last export file; the caller must hold _csv_export_lock or be exiting"""
+    if _csv_export:
+        try:
+            os.remove(_csv_export[2])
+        except OSError as e:
+            logger.warning(f"Error removing old CSV export: {e}")
+
+atexit.register(remove_csv_export)
+
+def gzip_chunks(chunks, compresslevel=5):
+    """Gzip a stream of text chunks, yielding compressed bytes as they are ready"""
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
+
 @app.route('/download_csv')
 def download_csv():
     if not concert_data:
         return jsonify({'error': 'No data available'}), 400
     
-    # Create temporary CSV file
-    temp_file = tempfile.NamedTemporaryFile(mode='w', delete=False, suffix='.csv', newline='')
+    filename = f'bandsintown_concerts_{time.strftime("%Y%m%d_%H%M%S")}.csv'
     
-    try:
-        writer = csv.DictWriter(temp_file, fieldnames=['artist_name', 'venue_name', 'venue_address', 'concert_date'])
-        writer.writeheader()
-        writer.writerows(concert_data)
-        temp_file.close()
-        
-        return send_file(temp_file.name, 
-                        as_attachment=True, 
-                        download_name=f'bandsintown_concerts_{datetime.now().strftime("%Y%m%d_%H%M%S")}.csv',
-                        mimetype='text/csv')
+    # Serve big exports from a file so interrupted downloads can resume; while a
+    # run is still adding rows the file would be rewritten on every request
+    if len(concert_data) > LARGE_CSV_ROWS and not scraping_status['is_running']:
+        with _status_lock:
+            concerts, run_id = concert_data, _run_id
+        export_file = open_csv_export(concerts, run_id)
+        stat = os.fstat(export_file.fileno())
+        response = send_file(export_file,
+                            as_attachment=True,
+                            download_name=filename,
+                            mimetype='text/csv',
+                            etag=f'{stat.st_mtime_ns:x}-{stat.st_size:x}',
+                            last_modified=stat.st_mtime)
+        # send_file can't size a file object, so do its range handling here;
+        # advertise ranges on full responses too so clients know they can resume
+        response.content_length = stat.st_size
+        response.accept_ranges = 'bytes'
+        try:
+            return response.make_conditional(request, accept_ranges=True, complete_length=stat.st_size)
+        except RequestedRangeNotSatisfiable:
+            export_file.close()
+            raise
     
-    except Exception as e:
-        logger.error(f"Error creating CSV: {e}")
-        return jsonify({'error': 'Failed to create CSV file'}), 500
+    headers = {'Content-Disposition': f'attachment; filename={filename}', 'Vary': 'Accept-Encoding'}
+    chunks = iter_csv_chunks(concert_data)
+    # Check the quality, not membership, so "gzip;q=0" counts as a refusal
+    if request.accept_encodings['gzip'] > 0:
+        headers['Content-Encoding'] = 'gzip'
+        chunks = gzip_chunks(chunks)
+    
+    return Response(stream_with_context(chunks), mimetype='text/csv', headers=headers)
 
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))